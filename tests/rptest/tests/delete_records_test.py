@@ -7,11 +7,14 @@
 # the Business Source License, use of this software will be governed
 # by the Apache License, Version 2.0
 
+import array
+import concurrent.futures
 import time
 import random
 import signal
 import string
 import threading
+import uuid
 import confluent_kafka as ck
 import ducktape
 
@@ -20,8 +23,7 @@ from rptest.services.cluster import cluster
 from rptest.services.kgo_verifier_services import KgoVerifierConsumerGroupConsumer, KgoVerifierProducer
 from rptest.tests.redpanda_test import RedpandaTest
 from rptest.clients.kcl import KCL
-from rptest.clients.kafka_cli_tools import KafkaCliTools
-from rptest.clients.rpk import RpkTool
+from rptest.clients.rpk import RpkTool, RpkPartition
 from ducktape.utils.util import wait_until
 from rptest.clients.types import TopicSpec
 from rptest.util import produce_until_segments, segments_count, wait_for_removal_of_n_segments, search_logs_with_timeout
@@ -49,22 +51,104 @@ class DeleteRecordsTest(RedpandaTest):
         self.kcl = KCL(self.redpanda)
         self.rpk = RpkTool(self.redpanda)
 
-    def get_topic_info(self):
-        topics_info = list(self.rpk.describe_topic(self.topic))
-        self.logger.info(topics_info)
-        assert len(topics_info) == 1
-        return topics_info[0]
+        # Long lived client used to query partition metadata and offsets
+        self._consumer = None
 
-    def wait_until_records(self, offset, timeout_sec=30, backoff_sec=1):
-        def expect_high_watermark():
-            topic_info = self.get_topic_info()
-            return topic_info.high_watermark == offset
+    def setUp(self):
+        super().setUp()
+        # read_uncommitted, as with read_committed get_watermark_offsets
+        # reports the last stable offset rather than the high watermark
+        config = {
+            'bootstrap.servers': self.redpanda.brokers(),
+            'group.id': f'probe-{id(self)}',
+            'enable.auto.commit': False,
+            'isolation.level': 'read_uncommitted',
+        }
+        self._consumer = ck.Consumer(config)
 
-        wait_until(expect_high_watermark,
-                   timeout_sec=timeout_sec,
-                   backoff_sec=backoff_sec)
+    def tearDown(self):
+        if self._consumer is not None:
+            self._consumer.close()
+            self._consumer = None
 
-    def delete_records(self, topic, partition, truncate_offset):
+        return super().tearDown()
+
+    def get_topic_info(self):
+        metadata = self._consumer.list_topics(self.topic, timeout=10)
+        partitions = metadata.topics[self.topic].partitions
+        assert len(partitions) == 1
+        partition = partitions[0]
+        assert partition.error is None, f"Partition error: {partition.error}"
+        tp = ck.TopicPartition(self.topic, 0)
+        low, high = self._consumer.get_watermark_offsets(tp,
+                                                         timeout=10,
+                                                         cached=False)
+        topic_info = RpkPartition(id=partition.id,
+                                  leader=partition.leader,
+                                  leader_epoch=None,
+                                  replicas=partition.replicas,
+                                  lso=None,
+                                  hw=high,
+                                  start_offset=low)
+        self.logger.info(topic_info)
+        return topic_info
+
+    def wait_until_records(self, offset, timeout_sec=30, max_backoff_sec=1):
+        """
+        Polls the high watermark with exponential backoff, starting at 50ms
+        and capped at max_backoff_sec, until it has reached offset.
+        """
+        deadline = time.monotonic() + timeout_sec
+        delay = 0.05
+        while True:
+            topic_info = self.get_topic_info()
+            if topic_info.high_watermark >= offset:
+                return
+            if time.monotonic() + delay > deadline:
+                raise ducktape.errors.TimeoutError(
+                    f"High watermark {topic_info.high_watermark} did not reach {offset}"
+                )
+            time.sleep(delay)
+            delay = min(delay * 1.8, max_backoff_sec)
+
+    def _produce_bulk(self, n, size):
+        """
+        Produces n records of the given size to partition 0 and waits for
+        all of them to be acknowledged by the cluster.
+        """
+        producer = ck.Producer({
+            'bootstrap.servers': self.redpanda.brokers(),
+            'linger.ms': 5,
+            'batch.size': 1 << 20,
+            'compression.type': 'lz4',
+            'acks': -1,
+            'enable.idempotence': True,
+        })
+        errors = []
+
+        def on_delivery(err, _msg):
+            # flush() also drains messages that failed delivery, failures
+            # are only reported here
+            if err is not None:
+                errors.append(err)
+
+        payload = random.randbytes(size)
+        for idx in range(n):
+            producer.produce(self.topic,
+                             payload,
+                             partition=0,
+                             on_delivery=on_delivery)
+            if idx % 1000 == 0:
+                producer.poll(0)
+        remaining = producer.flush(timeout=30)
+        assert remaining == 0, f"{remaining} records were not delivered"
+        assert not errors, f"{len(errors)} failed deliveries, first: {errors[0]}"
+
+    def delete_records(self,
+                       topic,
+                       partition,
+                       truncate_offset,
+                       timeout_ms=1000):
         """
         Makes delete records call with 1 topic partition in the request body.
 
@@ -74,31 +158,61 @@ class DeleteRecordsTest(RedpandaTest):
         response = self.kcl.delete_records(
             {topic: {
                 partition: truncate_offset
-            }})
+            }}, timeout_ms=timeout_ms)
         assert len(response) == 1
         assert response[0].topic == topic
         assert response[0].partition == partition
         assert response[0].error == 'OK', f"Err msg: {response[0].error}"
         return response[0].new_low_watermark
 
+    def consumable_offsets(self, offsets, timeout_sec=10):
+        """
+        Probes partition 0 at each of the given offsets using a single
+        consumer, returning the set of offsets at which a record was fetched.
+        """
+        consumer = ck.Consumer({
+            'bootstrap.servers': self.redpanda.brokers(),
+            'group.id': f'probe-{uuid.uuid4()}',
+            'enable.auto.commit': False,
+            'auto.offset.reset': 'error',
+        })
+        present = set()
+        try:
+            # librdkafka rejects duplicate partitions within one assignment,
+            # so the same consumer is re-assigned once per probed offset
+            for offset in offsets:
+                consumer.assign([ck.TopicPartition(self.topic, 0, offset)])
+                msgs = consumer.consume(num_messages=1, timeout=timeout_sec)
+                for msg in msgs:
+                    if msg.error() is None and msg.offset() == offset:
+                        present.add(offset)
+        finally:
+            consumer.close()
+        self.redpanda.logger.debug(
+            f"Probed offsets: {offsets} consumable: {present}")
+        return present
+
+    @staticmethod
+    def _check_start_boundary(present, truncate_offset):
+        assert truncate_offset in present, f"new log start: {truncate_offset} not consumable"
+        assert (
+            truncate_offset - 1
+        ) not in present, f"before log start: {truncate_offset - 1} is consumable"
+
+    @staticmethod
+    def _check_end_boundary(present, high_watermark):
+        assert (high_watermark -
+                1) in present, f"log end: {high_watermark - 1} not consumable"
+        assert high_watermark not in present, f"high watermark: {high_watermark} is consumable"
+
     def assert_start_partition_boundaries(self, truncate_offset):
-        def check_bound_start(offset):
-            try:
-                r = self.rpk.consume(self.topic,
-                                     n=1,
-                                     offset=f'{offset}-{offset+1}',
-                                     quiet=True,
-                                     timeout=10)
-                return r.count('_') == 1
-            except Exception as _:
-                return False
-
-        assert check_bound_start(
-            truncate_offset
-        ), f"new log start: {truncate_offset} not consumable"
-        assert not check_bound_start(
-            truncate_offset -
-            1), f"before log start: {truncate_offset - 1} is consumable"
+        present = self.consumable_offsets(
+            [truncate_offset - 1, truncate_offset])
+        self._check_start_boundary(present, truncate_offset)
+
+    def assert_end_partition_boundaries(self, high_watermark):
+        present = self.consumable_offsets([high_watermark - 1, high_watermark])
+        self._check_end_boundary(present, high_watermark)
 
     def assert_new_partition_boundaries(self, truncate_offset, high_watermark):
         """
@@ -106,33 +220,27 @@ class DeleteRecordsTest(RedpandaTest):
         ensuring the truncation worked at the exact requested point and that the
         number of remaining records is as expected.
         """
-        def check_bound_end(offset):
-            try:
-                # Not timing out means data was available to read
-                _ = self.rpk.consume(self.topic,
-                                     n=1,
-                                     offset=offset,
-                                     timeout=10)
-            except Exception as _:
-                return False
-            return True
-
         assert truncate_offset <= high_watermark, f"Test malformed"
 
         if truncate_offset == high_watermark:
             # Assert no data at all can be read
-            assert not check_bound_end(truncate_offset)
+            present = self.consumable_offsets([truncate_offset])
+            assert truncate_offset not in present, f"data readable after truncating at high watermark: {high_watermark}"
             return
 
+        # Probe every candidate boundary once, skipping offsets that cannot
+        # exist (e.g. one below a truncation at offset 0)
+        probe_offsets = sorted(
+            set(offset for offset in (truncate_offset - 1, truncate_offset,
+                                      high_watermark - 1, high_watermark)
+                if 0 <= offset <= high_watermark))
+        present = self.consumable_offsets(probe_offsets)
+
         # truncate_offset is inclusive start of log
         # high_watermark is exclusive end of log
         # Readable offsets: [truncate_offset, high_watermark)
-        self.assert_start_partition_boundaries(truncate_offset)
-        assert check_bound_end(
-            high_watermark -
-            1), f"log end: {high_watermark - 1} not consumable"
-        assert not check_bound_end(
-            high_watermark), f"high watermark: {high_watermark} is consumable"
+        self._check_start_boundary(present, truncate_offset)
+        self._check_end_boundary(present, high_watermark)
 
     @cluster(num_nodes=3)
     def test_delete_records_topic_start_delta(self):
@@ -147,26 +255,37 @@ class DeleteRecordsTest(RedpandaTest):
         truncate_offset_start = 100
 
         # Produce some data, wait for it all to arrive
-        kafka_tools = KafkaCliTools(self.redpanda)
-        kafka_tools.produce(self.topic, num_records, records_size)
-        self.wait_until_records(num_records, timeout_sec=10, backoff_sec=1)
-
-        # Call delete-records in a loop incrementing new point each time
-        for truncate_offset in range(truncate_offset_start,
-                                     truncate_offset_start + 5):
-            # Perform truncation
-            low_watermark = self.delete_records(self.topic, 0, truncate_offset)
-            assert low_watermark == truncate_offset, f"Expected low watermark: {truncate_offset} observed: {low_watermark}"
-
-            # Assert correctness of start and end offsets in topic metadata
-            topic_info = self.get_topic_info()
-            assert topic_info.id == 0, f"Partition id: {topic_info.id}"
-            assert topic_info.start_offset == truncate_offset, f"Start offset: {topic_info.start_offset}"
-            assert topic_info.high_watermark == num_records, f"High watermark: {topic_info.high_watermark}"
-
-            # ... and in actual fetch requests
-            self.assert_new_partition_boundaries(truncate_offset,
-                                                 topic_info.high_watermark)
+        self._produce_bulk(num_records, records_size)
+        self.wait_until_records(num_records, timeout_sec=10)
+
+        # Call delete-records in a loop incrementing new point each time. Each
+        # truncation moves the log start, so the start boundary must be checked
+        # before the next call. The end boundary is unaffected by subsequent
+        # truncations, so those probes (which wait out the fetch timeout at
+        # the high watermark) run in the background.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+            end_checks = []
+            for truncate_offset in range(truncate_offset_start,
+                                         truncate_offset_start + 5):
+                # Perform truncation
+                low_watermark = self.delete_records(self.topic, 0,
+                                                    truncate_offset)
+                assert low_watermark == truncate_offset, f"Expected low watermark: {truncate_offset} observed: {low_watermark}"
+
+                # Assert correctness of start and end offsets in topic metadata
+                topic_info = self.get_topic_info()
+                assert topic_info.id == 0, f"Partition id: {topic_info.id}"
+                assert topic_info.start_offset == truncate_offset, f"Start offset: {topic_info.start_offset}"
+                assert topic_info.high_watermark == num_records, f"High watermark: {topic_info.high_watermark}"
+
+                # ... and in actual fetch requests
+                self.assert_start_partition_boundaries(truncate_offset)
+                end_checks.append(
+                    executor.submit(self.assert_end_partition_boundaries,
+                                    topic_info.high_watermark))
+
+            for f in end_checks:
+                f.result()
 
     @cluster(num_nodes=3)
     @parametrize(truncate_point="at_segment_boundary")
@@ -201,22 +320,20 @@ class DeleteRecordsTest(RedpandaTest):
         assert len(snapshot) > 0, "empty snapshot"
         self.redpanda.logger.info(f"Snapshot: {snapshot}")
 
-        def get_segment_boundaries(node):
-            def to_final_indicies(seg):
-                return int(seg.data_file.split('-')[0]) - 1
-
-            indicies = [to_final_indicies(seg) for seg in node]
-            return sorted([idx for idx in indicies if idx != -1])
+        # Final offsets of all segments but the last on one node, i.e. one
+        # below each segment's base offset, computed once from the snapshot
+        node_segments = snapshot[list(snapshot.keys())[-1]]
+        segment_boundaries = array.array(
+            'q',
+            sorted(seg.offset - 1 for seg in node_segments if seg.offset != 0))
+        self.redpanda.logger.info(
+            f"Segment boundaries: {list(segment_boundaries)}")
 
         # Tests for 3 different types of scenarios
         # 1. User wants to truncate all data - high_watermark
         # 2. User wants to truncate at a segment boundary - at_segment_boundary
         # 3. User wants to trunate between a boundary - within_segment
-        def obtain_test_parameters(snapshot):
-            node = snapshot[list(snapshot.keys())[-1]]
-            segment_boundaries = get_segment_boundaries(node)
-            self.redpanda.logger.info(
-                f"Segment boundaries: {segment_boundaries}")
+        def obtain_test_parameters(segment_boundaries):
             truncate_offset = None
             expected_segments_removed = None
             high_watermark = int(self.get_topic_info().high_watermark)
@@ -245,7 +362,7 @@ class DeleteRecordsTest(RedpandaTest):
             return (truncate_offset, expected_segments_removed, high_watermark)
 
         (truncate_offset, expected_segments_removed,
-         high_watermark) = obtain_test_parameters(snapshot)
+         high_watermark) = obtain_test_parameters(segment_boundaries)
 
         # Make delete-records call, assert response looks ok
         try:
@@ -311,28 +428,27 @@ class DeleteRecordsTest(RedpandaTest):
         out_of_range_prefix = "OFFSET_OUT_OF_RANGE"
 
         # Produce some data, wait for it all to arrive
-        kafka_tools = KafkaCliTools(self.redpanda)
-        kafka_tools.produce(self.topic, num_records, records_size)
-        self.wait_until_records(num_records, timeout_sec=10, backoff_sec=1)
-
-        def check_bad_response(response):
-            assert len(response) == 1
-            assert response[0].topic == self.topic
-            assert response[0].partition == 0
-            assert response[0].new_low_watermark == -1
-            return response[0].error
+        self._produce_bulk(num_records, records_size)
+        self.wait_until_records(num_records, timeout_sec=10)
 
-        def bad_truncation(truncate_offset):
-            response = self.kcl.delete_records(
-                {self.topic: {
-                    0: truncate_offset
-                }})
-            assert check_bad_response(response).startswith(
-                out_of_range_prefix
-            ), f"Unexpected error msg: {response[0].error}"
+        def bad_truncation(offsets):
+            # One delete-records call per offset, each is expected to fail
+            for truncate_offset in offsets:
+                response = self.kcl.delete_records(
+                    {self.topic: {
+                        0: truncate_offset
+                    }})
+                assert len(response) == 1, f"Unexpected response: {response}"
+                assert response[0].topic == self.topic
+                assert response[0].partition == 0
+                low_watermark = response[0].new_low_watermark
+                assert low_watermark == -1, f"Offset {truncate_offset} low watermark: {low_watermark}"
+                assert response[0].error.startswith(
+                    out_of_range_prefix
+                ), f"Offset {truncate_offset} unexpected error msg: {response[0].error}"
 
         # Try truncating past the end of the log
-        bad_truncation(num_records + 1)
+        bad_truncation([num_records + 1])
 
         # Truncate to attempt to truncate before new beginning
         truncate_offset = 125
@@ -340,8 +456,7 @@ class DeleteRecordsTest(RedpandaTest):
         assert low_watermark == truncate_offset
 
         # Try to truncate before and at the low_watermark
-        bad_truncation(0)
-        bad_truncation(low_watermark)
+        bad_truncation([0, low_watermark])
 
         # Try to truncate at a specific edge case where the start and end
         # are 1 offset away from eachother
@@ -351,9 +466,7 @@ class DeleteRecordsTest(RedpandaTest):
             assert low_watermark == t_ofs
 
         # Assert that nothing is readable
-        bad_truncation(truncate_offset)
-        bad_truncation(num_records)
-        bad_truncation(num_records + 1)
+        bad_truncation([truncate_offset, num_records, num_records + 1])
 
     @cluster(num_nodes=3)
     def test_delete_records_empty_or_missing_topic_or_partition(self):
@@ -376,9 +489,9 @@ class DeleteRecordsTest(RedpandaTest):
         assert response[0].error.find(missing_partition) != -1
 
         # Assert out of range occurs on an empty topic
-        attempts = 5
-        response = []
-        while attempts > 0:
+        deadline = time.monotonic() + 5
+        delay = 0.1
+        while True:
             response = self.kcl.delete_records({self.topic: {0: 0}})
             assert len(response) == 1
             assert response[0].topic == self.topic
@@ -386,14 +499,15 @@ class DeleteRecordsTest(RedpandaTest):
             assert response[0].new_low_watermark == -1
             if not response[0].error.startswith("NOT_LEADER"):
                 break
-            time.sleep(1)
-            attempts -= 1
+            if time.monotonic() + delay > deadline:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
         assert response[0].error.startswith(out_of_range_prefix)
 
         # Assert correct behavior on a topic with 1 record
-        kafka_tools = KafkaCliTools(self.redpanda)
-        kafka_tools.produce(self.topic, 1, 512)
-        self.wait_until_records(1, timeout_sec=5, backoff_sec=1)
+        self._produce_bulk(1, 512)
+        self.wait_until_records(1, timeout_sec=5)
         response = self.kcl.delete_records({self.topic: {0: 0}})
         assert len(response) == 1
         assert response[0].new_low_watermark == -1
@@ -410,8 +524,7 @@ class DeleteRecordsTest(RedpandaTest):
         """
         Tests that the log_eviction_stm is respecting the max_collectible_offset
         """
-        payload = ''.join(
-            random.choice(string.ascii_letters) for _ in range(512))
+        payload = bytes(random.choices(string.ascii_letters.encode(), k=512))
         producer = ck.Producer({
             'bootstrap.servers': self.redpanda.brokers(),
             'transactional.id': '0',
@@ -421,15 +534,13 @@ class DeleteRecordsTest(RedpandaTest):
         def delete_records_within_transaction(reporter):
             try:
                 high_watermark = int(self.get_topic_info().high_watermark)
-                response = self.kcl.delete_records(
-                    {self.topic: {
-                        0: high_watermark
-                    }}, timeout_ms=5000)
-                assert len(response) == 1
+                low_watermark = self.delete_records(self.topic,
+                                                    0,
+                                                    high_watermark,
+                                                    timeout_ms=5000)
                 # Even though the on disk data may be late to evict, the start offset
                 # should have been immediately updated
-                assert response[0].new_low_watermark == high_watermark
-                assert response[0].error == 'OK'
+                assert low_watermark == high_watermark
             except Exception as e:
                 reporter.exc = e
 
@@ -488,13 +599,11 @@ class DeleteRecordsTest(RedpandaTest):
             truncate_point = random.randint(start_offset, high_watermark)
             self.redpanda.logger.info(
                 f"Issuing delete_records request at offset: {truncate_point}")
-            response = self.kcl.delete_records(
-                {self.topic: {
-                    0: truncate_point
-                }}, timeout_ms=5000)
-            assert len(response) == 1
-            assert response[0].new_low_watermark == truncate_point
-            assert response[0].error == 'OK'
+            low_watermark = self.delete_records(self.topic,
+                                                0,
+                                                truncate_point,
+                                                timeout_ms=5000)
+            assert low_watermark == truncate_point
             # Cannot assert end boundaries as there is a concurrent producer
             # moving the hwm forward
             self.assert_start_partition_boundaries(truncate_point)
@@ -536,16 +645,23 @@ class DeleteRecordsTest(RedpandaTest):
                 thread_sleep,
             ))
 
-        # Start up producer/consumer and thread that periodically issues delete records requests
-        delete_records_thread.start()
-        producer.start()
-        consumer.start()
-
-        # Shut down all threads started above
-        self.redpanda.logger.info("Joining on delete-records thread")
-        delete_records_thread.join()
-        self.redpanda.logger.info("Joining on producer thread")
-        producer.wait()
+        # Start up producer/consumer and thread that periodically issues delete records requests.
+        # The services are brought up concurrently so their remote setup overlaps.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            # list() re-raises any start() failure
+            list(
+                executor.map(lambda start: start(), [
+                    delete_records_thread.start, producer.start, consumer.start
+                ]))
+
+        # Shut down all threads started above. The consumer is only stopped once
+        # the producer has finished, the remaining joins are independent.
+        self.redpanda.logger.info(
+            "Joining on delete-records and producer threads")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            list(
+                executor.map(lambda wait: wait(),
+                             [delete_records_thread.join, producer.wait]))
         self.redpanda.logger.info("Calling consumer::stop")
         consumer.stop()
         self.redpanda.logger.info("Joining on consumer thread")